@@ -1,5 +1,7 @@
 import streamlit as st
 import os
+import shutil
+import hashlib
 from typing import List
 from utils.document_processor import DocumentProcessor
 from utils.vector_store import VectorStore
@@ -63,13 +65,27 @@ if "chat_history" not in st.session_state:
 if "documents_processed" not in st.session_state:
     st.session_state.documents_processed = False
 
+@st.cache_resource
+def get_vectorstore(embedding_model: str, persist_directory: str) -> VectorStore:
+    """Create the vector store once per process."""
+    return VectorStore(
+        embedding_model=embedding_model,
+        persist_directory=persist_directory
+    )
+
+def refresh_documents_processed():
+    """Allow questions only while the vector store holds chunks."""
+    info = st.session_state.vectorstore.get_collection_info()
+    st.session_state.documents_processed = info["count"] > 0
+
 def initialize_components():
     """Initialize the RAG components."""
     if st.session_state.vectorstore is None:
-        st.session_state.vectorstore = VectorStore(
-            embedding_model=Config.EMBEDDING_MODEL,
-            persist_directory=Config.VECTOR_STORE_DIR
+        st.session_state.vectorstore = get_vectorstore(
+            Config.EMBEDDING_MODEL,
+            Config.VECTOR_STORE_DIR
         )
+        refresh_documents_processed()
     if st.session_state.rag_chain is None:
         st.session_state.rag_chain = RAGChain(st.session_state.vectorstore)
 
@@ -155,40 +171,61 @@ def process_documents(uploaded_files):
     try:
         with st.spinner("⏳ Processing documents..."):
             os.makedirs(Config.DATA_DIR, exist_ok=True)
+            processor = DocumentProcessor(
+                chunk_size=Config.CHUNK_SIZE,
+                chunk_overlap=Config.CHUNK_OVERLAP
+            )
+            ingested = st.session_state.vectorstore.get_document_hashes()
+            file_hashes = {}
+            documents = []
             file_paths = []
             for uploaded_file in uploaded_files:
+                file_hash = hashlib.sha256(uploaded_file.getbuffer()).hexdigest()
+                # Skip content already stored or already seen in this batch
+                if file_hash in ingested or file_hash in file_hashes.values():
+                    continue
+                if uploaded_file.name.lower().endswith(".txt"):
+                    # Plain text needs no parser, so skip the disk round-trip;
+                    # nothing is written, so the upload name is the source
+                    file_hashes[uploaded_file.name] = file_hash
+                    try:
+                        text = processor.decode_text(uploaded_file.getbuffer())
+                        documents.extend(processor.process_text(text, uploaded_file.name))
+                    except Exception as e:
+                        print(f"Error processing {uploaded_file.name}: {str(e)}")
+                    continue
                 file_path = os.path.join(Config.DATA_DIR, uploaded_file.name)
+                file_hashes[file_path] = file_hash
+                uploaded_file.seek(0)
                 with open(file_path, "wb") as f:
-                    f.write(uploaded_file.getbuffer())
+                    shutil.copyfileobj(uploaded_file, f, length=1024 * 1024)
                 file_paths.append(file_path)
-            processor = DocumentProcessor(
-                chunk_size=Config.CHUNK_SIZE,
-                chunk_overlap=Config.CHUNK_OVERLAP
-            )
-            documents = processor.process_multiple_documents(file_paths)
+            if not file_hashes:
+                refresh_documents_processed()
+                st.info("All selected documents have already been processed.", icon="ℹ️")
+                return
+            documents.extend(processor.process_multiple_documents(file_paths))
             if documents:
+                for doc in documents:
+                    doc.metadata["doc_hash"] = file_hashes[doc.metadata["source"]]
                 st.session_state.vectorstore.add_documents(documents)
-                st.session_state.documents_processed = True
+                refresh_documents_processed()
                 st.success(f"✅ Successfully processed document(s). You can now ask questions!", icon="🎉")
             else:
-                st.session_state.documents_processed = False
+                refresh_documents_processed()
                 st.error("❌ No documents were successfully processed.", icon="🚫")
     except Exception as e:
-        st.session_state.documents_processed = False
+        refresh_documents_processed()
         st.error(f"Error processing documents: {str(e)}", icon="🚫")
 
 def ask_question(question: str, show_sources: bool, show_context: bool):
     """Process user question and display answer."""
     try:
         with st.spinner("🤔 Thinking..."):
-            result = st.session_state.rag_chain.generate_answer(question)
+            result = st.session_state.rag_chain.generate_answer(question, stream=True)
         st.markdown("### 🧠 Answer")
-        st.info(result["answer"])
-        st.session_state.chat_history.append({
-            "question": question,
-            "answer": result["answer"],
-            "sources": result["sources"]
-        })
+        placeholder = st.empty()
+        # Sources and context are known before the answer streams in
         if show_sources and result["sources"]:
             st.markdown("### 📚 Sources")
             for i, source in enumerate(result["sources"], 1):
@@ -197,6 +234,19 @@ def ask_question(question: str, show_sources: bool, show_context: bool):
         if show_context and result["context"]:
             with st.expander("🔍 Retrieved Context"):
                 st.text_area("Context used for answering:", result["context"], height=200)
+        if isinstance(result["answer"], str):
+            answer = result["answer"]
+        else:
+            answer = ""
+            for text in result["answer"]:
+                answer += text
+                placeholder.info(answer)
+        placeholder.info(answer)
+        st.session_state.chat_history.append({
+            "question": question,
+            "answer": answer,
+            "sources": result["sources"]
+        })
     except Exception as e:
         st.error(f"Error generating answer: {str(e)}")
 
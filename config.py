@@ -13,7 +13,7 @@ class Config:
     GEMINI_MODEL = "gemini-1.5-flash"
     
     # Vector Store Configuration
-    VECTOR_STORE_TYPE = "chromadb"  # Options: chromadb, faiss
+    VECTOR_STORE_TYPE = "faiss"
     EMBEDDING_MODEL = "all-MiniLM-L6-v2"
     CHUNK_SIZE = 1000
     CHUNK_OVERLAP = 200
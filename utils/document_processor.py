@@ -1,5 +1,12 @@
 import os
-import PyPDF2
+import mmap
+import hashlib
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+    import PyPDF2
+from concurrent.futures import ThreadPoolExecutor
 import docx
 from typing import List, Dict
 from langchain.text_splitter import RecursiveCharacterTextSplitter
@@ -13,37 +20,54 @@ class DocumentProcessor:
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
             length_function=len,
+            keep_separator=False,
         )
     
     def extract_text_from_pdf(self, file_path: str) -> str:
         """Extract text from PDF file."""
-        text = ""
+        parts = []
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
+            if pdfium is not None:
+                pdf = pdfium.PdfDocument(file_path)
+                try:
+                    for page in pdf:
+                        parts.append(page.get_textpage().get_text_range())
+                finally:
+                    pdf.close()
+            else:
+                with open(file_path, 'rb') as file:
+                    pdf_reader = PyPDF2.PdfReader(file)
+                    for page in pdf_reader.pages:
+                        parts.append(page.extract_text())
         except Exception as e:
             print(f"Error reading PDF {file_path}: {str(e)}")
-        return text
+        return "".join(parts)
     
     def extract_text_from_docx(self, file_path: str) -> str:
         """Extract text from DOCX file."""
-        text = ""
+        parts = []
         try:
             doc = docx.Document(file_path)
             for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
+                parts.append(paragraph.text + "\n")
         except Exception as e:
             print(f"Error reading DOCX {file_path}: {str(e)}")
-        return text
+        return "".join(parts)
+    
+    def decode_text(self, data) -> str:
+        """Decode UTF-8 text from any bytes-like object without copying it first."""
+        return str(data, 'utf-8')
     
     def extract_text_from_txt(self, file_path: str) -> str:
         """Extract text from TXT file."""
         text = ""
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                text = file.read()
+            with open(file_path, 'rb') as file:
+                if os.fstat(file.fileno()).st_size == 0:
+                    return text
+                # Decode straight from the page cache, no intermediate bytes copy
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    text = self.decode_text(mapped)
         except Exception as e:
             print(f"Error reading TXT {file_path}: {str(e)}")
         return text
@@ -61,31 +85,55 @@ class DocumentProcessor:
         else:
             raise ValueError(f"Unsupported file format: {file_extension}")
         
+        return self.process_text(text, file_path)
+    
+    def process_text(self, text: str, file_path: str) -> List[Document]:
+        """Chunk already-extracted text for the given source path."""
         if not text.strip():
             raise ValueError(f"No text extracted from {file_path}")
         
-        # Create document with metadata
-        document = Document(
-            page_content=text,
-            metadata={
-                "source": file_path,
-                "filename": os.path.basename(file_path)
-            }
-        )
+        # pdfium and raw bytes keep CRLF; the splitter separators expect LF
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
         
-        # Split document into chunks
-        chunks = self.text_splitter.split_documents([document])
+        # Split text into chunks and attach metadata
+        filename = os.path.basename(file_path)
+        seen = set()
+        chunks = []
+        for i, chunk in enumerate(self.text_splitter.split_text(text)):
+            # Drop exact repeats such as page headers and footers
+            digest = hashlib.blake2b(chunk.encode("utf-8"), digest_size=16).digest()
+            if digest in seen:
+                continue
+            seen.add(digest)
+            chunks.append(Document(
+                page_content=chunk,
+                metadata={
+                    "source": file_path,
+                    "filename": filename,
+                    "chunk": i
+                }
+            ))
         
         return chunks
     
     def process_multiple_documents(self, file_paths: List[str]) -> List[Document]:
-        """Process multiple documents and return all chunks."""
+        """Process multiple documents in parallel and return all chunks."""
         all_chunks = []
-        for file_path in file_paths:
-            try:
-                chunks = self.process_document(file_path)
-                all_chunks.extend(chunks)
-            except Exception as e:
-                print(f"Error processing {file_path}: {str(e)}")
-                continue
+        if not file_paths:
+            return all_chunks
+        
+        # PDFium extraction releases the GIL, so threads overlap the heavy part
+        max_workers = min(len(file_paths), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                (file_path, executor.submit(self.process_document, file_path))
+                for file_path in file_paths
+            ]
+            for file_path, future in futures:
+                try:
+                    chunks = future.result()
+                    all_chunks.extend(chunks)
+                except Exception as e:
+                    print(f"Error processing {file_path}: {str(e)}")
+                    continue
         return all_chunks
\ No newline at end of file
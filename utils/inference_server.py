@@ -0,0 +1,60 @@
+import asyncio
+import queue
+import threading
+from typing import Iterator, Optional
+import google.generativeai as genai
+
+class InferenceServer:
+    """Run Gemini requests on one shared background event loop.
+
+    Gemini has no multi-prompt call, so requests are not batched; each one
+    is dispatched as soon as it is submitted.
+    """
+
+    def __init__(self, model: genai.GenerativeModel):
+        self.model = model
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+    async def _generate(self, prompt: str, chunks: Optional[queue.Queue]) -> str:
+        """Run one prompt, forwarding streamed text to chunks if given."""
+        if chunks is None:
+            response = await self.model.generate_content_async(prompt)
+            return response.text
+
+        parts = []
+        response = await self.model.generate_content_async(prompt, stream=True)
+        async for chunk in response:
+            parts.append(chunk.text)
+            chunks.put(chunk.text)
+        return "".join(parts)
+
+    async def submit_async(self,
+                           prompt: str,
+                           chunks: Optional[queue.Queue] = None) -> str:
+        """Run a prompt on the server loop and await its answer from any loop."""
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(
+            self._generate(prompt, chunks), self._loop
+        ))
+
+    def submit(self, prompt: str) -> str:
+        """Run a prompt from synchronous code and block until answered."""
+        return asyncio.run_coroutine_threadsafe(
+            self._generate(prompt, None), self._loop
+        ).result()
+
+    def submit_stream(self, prompt: str) -> Iterator[str]:
+        """Run a prompt from synchronous code and yield text as it streams in."""
+        chunks = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(
+            self._generate(prompt, chunks), self._loop
+        )
+        future.add_done_callback(lambda _: chunks.put(None))
+        while True:
+            text = chunks.get()
+            if text is None:
+                break
+            yield text
+        # Surface any error raised while streaming
+        future.result()
@@ -1,9 +1,34 @@
 import google.generativeai as genai
+import streamlit as st
 from typing import List, Dict, Any
 from langchain.schema import Document
 from utils.vector_store import VectorStore
+from utils.inference_server import InferenceServer
 from config import Config
 
+PROMPT_TEMPLATE = """You are a helpful AI assistant that answers questions based on the provided context. 
+        Use the following context to answer the user's question. If the answer cannot be found in the context, 
+        say so clearly.
+
+Context:
+{context}
+
+Question: {query}
+
+Answer: Please provide a comprehensive answer based on the context above. If the information is not 
+available in the context, please state that clearly."""
+
+@st.cache_resource
+def get_gemini_model(model_name: str) -> genai.GenerativeModel:
+    """Create the Gemini model client once per process."""
+    genai.configure(api_key=Config.GOOGLE_API_KEY)
+    return genai.GenerativeModel(model_name)
+
+@st.cache_resource
+def get_inference_server(model_name: str) -> InferenceServer:
+    """Start the shared dispatch loop for Gemini requests."""
+    return InferenceServer(get_gemini_model(model_name))
+
 class RAGChain:
     def __init__(self, vector_store: VectorStore):
         self.vector_store = vector_store
@@ -11,8 +36,8 @@ class RAGChain:
     
     def setup_gemini(self):
         """Setup Google Gemini API."""
-        genai.configure(api_key=Config.GOOGLE_API_KEY)
-        self.model = genai.GenerativeModel(Config.GEMINI_MODEL)
+        self.model = get_gemini_model(Config.GEMINI_MODEL)
+        self.server = get_inference_server(Config.GEMINI_MODEL)
     
     def retrieve_documents(self, query: str, k: int = 4) -> List[Document]:
         """Retrieve relevant documents for the query."""
@@ -23,32 +48,17 @@ class RAGChain:
         if not documents:
             return "No relevant context found."
         
-        context_parts = []
-        for i, doc in enumerate(documents, 1):
-            source = doc.metadata.get('filename', 'Unknown source')
-            content = doc.page_content.strip()
-            context_parts.append(f"Document {i} (Source: {source}):\n{content}")
-        
-        return "\n\n".join(context_parts)
+        return "\n\n".join(
+            f"Document {i} (Source: {doc.metadata.get('filename', 'Unknown source')}):\n{doc.page_content.strip()}"
+            for i, doc in enumerate(documents, 1)
+        )
     
     def generate_prompt(self, query: str, context: str) -> str:
         """Generate the prompt for the LLM."""
-        prompt = f"""You are a helpful AI assistant that answers questions based on the provided context. 
-        Use the following context to answer the user's question. If the answer cannot be found in the context, 
-        say so clearly.
-
-Context:
-{context}
-
-Question: {query}
-
-Answer: Please provide a comprehensive answer based on the context above. If the information is not 
-available in the context, please state that clearly."""
-        
-        return prompt
+        return PROMPT_TEMPLATE.format(context=context, query=query)
     
-    def generate_answer(self, query: str, k: int = 4) -> Dict[str, Any]:
-        """Generate answer using RAG pipeline."""
+    def generate_answer(self, query: str, k: int = 4, stream: bool = False) -> Dict[str, Any]:
+        """Generate answer using RAG pipeline; with stream=True the answer is a text iterator."""
         try:
             # Step 1: Retrieve relevant documents
             documents = self.retrieve_documents(query, k=k)
@@ -67,8 +77,10 @@ available in the context, please state that clearly."""
             prompt = self.generate_prompt(query, context)
             
             # Step 4: Get response from Gemini
-            response = self.model.generate_content(prompt)
-            answer = response.text
+            if stream:
+                answer = self.server.submit_stream(prompt)
+            else:
+                answer = self.server.submit(prompt)
             
             # Step 5: Extract sources
             sources = []
@@ -1,14 +1,44 @@
 import os
-import pysqlite3
-import sys
-sys.modules["sqlite3"] = sys.modules.pop("pysqlite3")
-import chromadb
+import hashlib
+from collections import OrderedDict
+import pickle
+import threading
+import diskcache
+import faiss
 from typing import List, Optional
 from sentence_transformers import SentenceTransformer
 from langchain.schema import Document
 from langchain.embeddings import SentenceTransformerEmbeddings
-from langchain.vectorstores import Chroma
 import numpy as np
+import streamlit as st
+import torch
+
+EMBEDDING_BATCH_SIZE = 64
+SEARCH_CACHE_SIZE = 256
+INDEX_FILE = "index.faiss"
+DOCSTORE_FILE = "docstore.pkl"
+
+# HNSW graph parameters
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
+@st.cache_resource
+def get_embeddings(model_name: str) -> SentenceTransformerEmbeddings:
+    """Load the embedding model once per process."""
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    embeddings = SentenceTransformerEmbeddings(
+        model_name=model_name,
+        model_kwargs={"device": device},
+        encode_kwargs={
+            "batch_size": EMBEDDING_BATCH_SIZE,
+            "normalize_embeddings": True
+        }
+    )
+    if device == "cuda":
+        # FP16 inference halves memory bandwidth on GPU
+        embeddings.client.half()
+    return embeddings
 
 class VectorStore:
     def __init__(self, 
@@ -16,79 +46,194 @@ class VectorStore:
                  persist_directory: str = "vectorstore"):
         self.embedding_model_name = embedding_model
         self.persist_directory = persist_directory
-        self.embeddings = SentenceTransformerEmbeddings(
-            model_name=embedding_model
-        )
-        self.vectorstore = None
+        self.embeddings = get_embeddings(embedding_model)
+        self._st_model: SentenceTransformer = self.embeddings.client
+        self._dimension = self._st_model.get_sentence_embedding_dimension()
+        self._index = None
+        self._docs: List[Document] = []
+        self._lock = threading.RLock()
+        
+        # Search results are cached per collection version
+        self._version = 0
+        self._search_cache = OrderedDict()
         
         # Create directory if it doesn't exist
         os.makedirs(persist_directory, exist_ok=True)
+        self._index_path = os.path.join(persist_directory, INDEX_FILE)
+        self._docstore_path = os.path.join(persist_directory, DOCSTORE_FILE)
+        
+        # Embedding cache keyed by model name + chunk text
+        self._cache = diskcache.Cache(os.path.join(persist_directory, "emb_cache"))
+        
+        # Re-attach any collection already on disk
+        self.load_vectorstore()
+    
+    def _new_index(self) -> faiss.Index:
+        """Create an empty HNSW index over FP16-stored, normalized vectors."""
+        index = faiss.IndexHNSWSQ(
+            self._dimension,
+            faiss.ScalarQuantizer.QT_fp16,
+            HNSW_M,
+            faiss.METRIC_INNER_PRODUCT
+        )
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+        return index
+    
+    def _persist(self) -> None:
+        """Write the index and its documents to disk."""
+        # Write both files in full before swapping either into place
+        index_tmp = self._index_path + ".tmp"
+        docstore_tmp = self._docstore_path + ".tmp"
+        faiss.write_index(self._index, index_tmp)
+        with open(docstore_tmp, "wb") as f:
+            pickle.dump({"docs": self._docs}, f)
+        os.replace(index_tmp, self._index_path)
+        os.replace(docstore_tmp, self._docstore_path)
     
     def create_vectorstore(self, documents: List[Document]) -> None:
         """Create a new vector store from documents."""
-        self.vectorstore = Chroma.from_documents(
-            documents=documents,
-            embedding=self.embeddings,
-            persist_directory=self.persist_directory,
-            collection_name="rag_collection"
-        )
-        self.vectorstore.persist()
+        with self._lock:
+            self._index = self._new_index()
+            self._docs = []
+            self.add_documents(documents)
     
     def load_vectorstore(self) -> bool:
         """Load existing vector store."""
         try:
-            self.vectorstore = Chroma(
-                persist_directory=self.persist_directory,
-                embedding_function=self.embeddings,
-                collection_name="rag_collection"
-            )
+            with self._lock:
+                if os.path.exists(self._index_path) and os.path.exists(self._docstore_path):
+                    index = faiss.read_index(self._index_path)
+                    index.hnsw.efSearch = HNSW_EF_SEARCH
+                    with open(self._docstore_path, "rb") as f:
+                        docstore = pickle.load(f)
+                    self._index = index
+                    self._docs = docstore["docs"]
+                    if index.ntotal != len(self._docs):
+                        # Interrupted write; the docstore holds the text, so rebuild from it
+                        print(f"Vector index has {index.ntotal} vectors for "
+                              f"{len(self._docs)} documents, rebuilding index")
+                        self._index = self._new_index()
+                        if self._docs:
+                            self._index.add(self.embed_documents(self._docs))
+                        self._persist()
+                else:
+                    self._index = self._new_index()
+                    self._docs = []
+                self._version += 1
             return True
         except Exception as e:
             print(f"Error loading vector store: {str(e)}")
             return False
     
+    def _cache_key(self, text: str) -> str:
+        """Build the embedding cache key for a chunk of text."""
+        return hashlib.sha256(
+            (self.embedding_model_name + "\x00" + text).encode("utf-8")
+        ).hexdigest()
+    
+    def embed_documents(self, documents: List[Document]) -> np.ndarray:
+        """Embed documents, reusing cached vectors for previously seen chunks."""
+        keys = [self._cache_key(doc.page_content) for doc in documents]
+        vectors = [self._cache.get(key) for key in keys]
+        misses = [i for i, vector in enumerate(vectors) if vector is None]
+        
+        if misses:
+            new_vectors = self._st_model.encode(
+                [documents[i].page_content for i in misses],
+                batch_size=EMBEDDING_BATCH_SIZE,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            ).astype(np.float32)
+            for i, vector in zip(misses, new_vectors):
+                # Normalized vectors fit FP16 with negligible loss at half the size
+                self._cache.set(keys[i], vector.astype(np.float16))
+                vectors[i] = vector
+        
+        return np.vstack(vectors).astype(np.float32)
+    
     def add_documents(self, documents: List[Document]) -> None:
         """Add new documents to existing vector store."""
-        if self.vectorstore is None:
-            self.create_vectorstore(documents)
-        else:
-            self.vectorstore.add_documents(documents)
-            self.vectorstore.persist()
+        if not documents:
+            return
+        
+        embeddings = self.embed_documents(documents)
+        with self._lock:
+            if self._index is None:
+                self.load_vectorstore()
+            self._index.add(embeddings)
+            self._docs.extend(documents)
+            self._persist()
+            self._version += 1
     
     def similarity_search(self, 
                          query: str, 
                          k: int = 4) -> List[Document]:
         """Perform similarity search and return relevant documents."""
-        if self.vectorstore is None:
-            return []
+        # Normalized text is only the cache key; the embedder sees the query as typed
+        normalized = " ".join(query.lower().split())
+        with self._lock:
+            # The store is shared across sessions, so check under the lock
+            if self._index is None:
+                return []
+            key = (normalized, k, self._version)
+            if key in self._search_cache:
+                self._search_cache.move_to_end(key)
+                return list(self._search_cache[key])
         
-        return self.vectorstore.similarity_search(query, k=k)
+        documents = [doc for doc, _ in self.similarity_search_with_score(query, k=k)]
+        with self._lock:
+            self._search_cache[key] = tuple(documents)
+            if len(self._search_cache) > SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+        return documents
     
     def similarity_search_with_score(self, 
                                    query: str, 
                                    k: int = 4) -> List[tuple]:
-        """Perform similarity search with scores."""
-        if self.vectorstore is None:
-            return []
-        
-        return self.vectorstore.similarity_search_with_score(query, k=k)
+        """Perform similarity search with scores (inner product, higher is closer)."""
+        query_vector = np.asarray([self.embeddings.embed_query(query)], dtype=np.float32)
+        with self._lock:
+            if self._index is None or self._index.ntotal == 0:
+                return []
+            scores, indices = self._index.search(query_vector, k)
+            return [
+                (self._docs[i], float(score))
+                for score, i in zip(scores[0], indices[0])
+                if i >= 0
+            ]
     
     def delete_collection(self) -> None:
         """Delete the vector store collection."""
-        if self.vectorstore is not None:
-            self.vectorstore.delete_collection()
-            self.vectorstore = None
+        with self._lock:
+            if self._index is not None:
+                for path in (self._index_path, self._docstore_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+                self._index = None
+                self._docs = []
+                self._version += 1
+            # Cleared documents should not linger on disk as cached embeddings
+            self._cache.clear()
+    
+    def get_document_hashes(self) -> set:
+        """Get the content hashes of all ingested files."""
+        with self._lock:
+            return {
+                doc.metadata["doc_hash"]
+                for doc in self._docs
+                if "doc_hash" in doc.metadata
+            }
     
     def get_collection_info(self) -> dict:
         """Get information about the collection."""
-        if self.vectorstore is None:
+        if self._index is None:
             return {"status": "No collection loaded", "count": 0}
         
         try:
-            collection = self.vectorstore._collection
-            count = collection.count()
+            count = self._index.ntotal
             return {"status": "Collection loaded", "count": count}
         except Exception as e:
 
-            return {"status": f"Error: {str(e)}", "count": 0}
-
+            return {"status": f"Error: {str(e)}", "count": 0}
\ No newline at end of file